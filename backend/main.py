@@ -1,15 +1,46 @@
+import asyncio
+import os
 import random
-from typing import Dict, Optional, List, Set
-
-from fastapi import FastAPI, Query, HTTPException
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Dict, FrozenSet, Optional, List, Set, Tuple
+
+import numpy as np
+import pandas as pd
+import orjson
+import requests
+from fastapi import FastAPI, Path, Query, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from requests.adapters import HTTPAdapter
 
-from cachetools import TTLCache
+from cachetools import TTLCache, cached
+from nba_api.stats.library.http import NBAStatsHTTP
 from nba_api.stats.static import players as nba_players
 from nba_api.stats.static import teams as nba_teams
 from nba_api.stats.endpoints import commonplayerinfo, commonteamroster, leaguedashplayerstats
 
-app = FastAPI()
+# One pooled session for every stats.nba.com call, so back-to-back and concurrent
+# endpoint calls reuse warm TLS connections. Pool size covers ROSTER_FETCH_WORKERS.
+NBA_SESSION = requests.Session()
+NBA_SESSION.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=10))
+NBAStatsHTTP.set_session(NBA_SESSION)
+NBA_API_TIMEOUT = 10  # seconds; nba_api defaults to 30, long enough for one team to stall startup
+
+
+class OrjsonResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson, which is several times faster than stdlib json
+    on the lists of small dicts these endpoints return.
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
+
+
+app = FastAPI(default_response_class=OrjsonResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -61,92 +92,169 @@ def parse_height_inches(height_text: str) -> int:
         return 0
 
 
-def three_pt_pct(row) -> float:
+def three_pt_pct(fg3_pct: pd.Series) -> np.ndarray:
     """
     Returns 3PT% as a percent number (0-100), not 0-1.
     LeagueDashPlayerStats FG3_PCT is usually 0-1.
     """
-    val = row.get("FG3_PCT", 0)
-    try:
-        v = float(val)
-    except Exception:
-        return 0.0
+    v = pd.to_numeric(fg3_pct, errors="coerce").to_numpy(dtype=np.float64)
 
     # If it looks like 0.35, convert to 35.0
-    return v * 100.0 if v <= 1.0 else v
+    return np.where(v <= 1.0, v * 100.0, v)
+
+
+# raw roster positions the rules know about; POSITION_LUT row = index here, last row = anything else
+RAW_POSITIONS = ["F-C", "F", "G-F", "G", "C"]
+MAX_HEIGHT_IN = 100  # every threshold below is well under this, so taller players clip to it
+SHORT_F = "F_short"  # F under 6'9": SF or PF depending on 3PT%, resolved in build_candidates
 
 
-def normalize_position(raw_pos: str, height_text: str, fg3_pct_percent: float) -> str:
+def position_slot(raw_pos: str, height_in: int) -> str:
     """
-    Derive PG / SG / SF / PF / C using roster position + height rules.
-    Adds extra SF rule for F:
-      - if shorter than 6'9 AND 3PT% >= 32% => SF
-      - else PF
+    Position + height rules for one (raw position, height) pair.
     """
-    p = (raw_pos or "").upper().strip()
-    h = parse_height_inches(height_text)
-
-    # F-C split
-    if p == "F-C":
-        return "C" if h >= 82 else "PF"  # 6'10" = 82 inches
+    if raw_pos == "F-C":
+        return "C" if height_in >= 82 else "PF"   # F-C: 6'10" = 82 inches
+    if raw_pos == "F":
+        return "PF" if height_in >= 81 else SHORT_F  # F: 6'9" = 81 inches
+    if raw_pos == "G-F":
+        return "SF" if height_in >= 78 else "SG"  # G-F: 6'6" = 78 inches
+    if raw_pos == "G":
+        return "SG" if height_in >= 77 else "PG"  # G: 6'5" = 77 inches
+    if raw_pos == "C":
+        return "C"                                # C stays C
+    return "SF"  # fallback SF
+
+
+# POSITION_LUT[position code, height_in] -> slot (or SHORT_F), built once at import
+POSITION_LUT = np.array(
+    [[position_slot(p, h) for h in range(MAX_HEIGHT_IN + 1)] for p in RAW_POSITIONS + [""]]
+)
 
-    # F split (UPDATED)
-    if p == "F":
-        if h >= 81:  # 6'9" = 81 inches
-            return "PF"
-        # shorter than 6'9"
-        return "SF" if fg3_pct_percent >= 32.0 else "PF"
 
-    # G-F split
-    if p == "G-F":
-        return "SF" if h >= 78 else "SG"  # 6'6" = 78 inches
+def base_slots(raw_pos: pd.Series, height_in: np.ndarray) -> np.ndarray:
+    """
+    Table lookup of the slot for many players at once; short F come back as SHORT_F.
+    """
+    p = raw_pos.fillna("").astype(str).str.upper().str.strip()
+    codes = pd.Categorical(p, categories=RAW_POSITIONS).codes  # unknown -> -1, the last row
+    return POSITION_LUT[codes, np.clip(np.asarray(height_in), 0, MAX_HEIGHT_IN)]
 
-    # G split
-    if p == "G":
-        return "SG" if h >= 77 else "PG"  # 6'5" = 77 inches
 
-    # C stays C
-    if p == "C":
-        return "C"
+def production_scores(df: pd.DataFrame) -> np.ndarray:
+    """
+    Per-game production score for every row of a LeagueDashPlayerStats frame.
+    """
+    return (
+        df["PTS"].to_numpy(dtype=np.float64)
+        + 1.2 * df["REB"].to_numpy(dtype=np.float64)
+        + 1.5 * df["AST"].to_numpy(dtype=np.float64)
+        + 3.0 * df["STL"].to_numpy(dtype=np.float64)
+        + 3.0 * df["BLK"].to_numpy(dtype=np.float64)
+        - 2.0 * df["TOV"].to_numpy(dtype=np.float64)
+    )
 
-    # fallback
-    return "SF"
 
+def clamp_tier(t: int) -> int:
+    return max(1, min(16, t))
 
 
-def production_score_pergame(row) -> float:
-    pts = float(row.get("PTS", 0))
-    reb = float(row.get("REB", 0))
-    ast = float(row.get("AST", 0))
-    stl = float(row.get("STL", 0))
-    blk = float(row.get("BLK", 0))
-    tov = float(row.get("TOV", 0))
-    return pts + 1.2 * reb + 1.5 * ast + 3.0 * stl + 3.0 * blk - 2.0 * tov
+def tier_expansion_order(desired: int) -> Tuple[int, ...]:
+    """
+    desired tier first, then expand outward (one below, one above, ...) within 1..16.
+    """
+    order = [desired]
+    for d in range(1, 16):
+        lo = desired - d
+        hi = desired + d
+        if lo >= 1:
+            order.append(lo)
+        if hi <= 16:
+            order.append(hi)
+    return tuple(order)
 
 
-def clamp_tier(t: int) -> int:
-    return max(1, min(16, t))
+# TIER_EXPANSION_ORDER[desired - 1] -> banker_offer's tier search order for that target
+TIER_EXPANSION_ORDER = tuple(tier_expansion_order(d) for d in range(1, 17))
 
 
-def split_into_16_tiers(players_sorted_desc: List[dict]) -> List[List[dict]]:
+def split_into_16_tiers(order_desc: np.ndarray) -> List[np.ndarray]:
     """
-    players_sorted_desc must already be sorted by score desc.
-    Returns tiers[0..15] each list of players in that tier.
+    order_desc must be candidate indices sorted by score desc.
+    Returns tiers[0..15] each array of candidate indices in that tier.
     """
-    n = len(players_sorted_desc)
-    tiers: List[List[dict]] = [[] for _ in range(16)]
+    n = len(order_desc)
 
     gamma = 3  # tune: 1.2 mild, 1.6 good start, 2.0 strong
 
-    for i, p in enumerate(players_sorted_desc):
-        rank = 1.0 - (i / (n - 1) if n > 1 else 0.0)  # best=1, worst=0
-        tier_idx = 15 - int((rank ** gamma) * 16)     # best->0, worst->15
-        tier_idx = min(15, max(0, tier_idx))
-        tiers[tier_idx].append(p)
+    rank = 1.0 - (np.arange(n) / (n - 1) if n > 1 else np.zeros(n))  # best=1, worst=0
+    tier_idx = 15 - ((rank ** gamma) * 16).astype(np.int64)           # best->0, worst->15
+    tier_idx = np.clip(tier_idx, 0, 15)
+
+    # tier_idx never decreases down the order, so each tier is one contiguous slice
+    return np.split(order_desc, np.searchsorted(tier_idx, np.arange(1, 16)))
+
+
+
+
+# -----------------------
+# Disk cache (survives restarts)
+# -----------------------
+CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache"))
+
+
+def disk_cache_path(kind: str, season: str) -> str:
+    return os.path.join(CACHE_DIR, f"{kind}_{season.replace('-', '_')}.pkl")
+
 
-    return tiers
+def load_disk_cache(path: str, max_age: float):
+    """
+    Returns the pickled object at path, or None if missing, stale or unreadable.
+    """
+    try:
+        if time.time() - os.path.getmtime(path) > max_age:
+            return None
+        return pd.read_pickle(path)
+    except Exception:
+        return None
 
 
+def save_disk_cache(path: str, obj) -> None:
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp"
+        pd.to_pickle(obj, tmp)
+        os.replace(tmp, path)  # readers never see a half-written file
+    except Exception as e:
+        print(f"[cache] could not write {path}: {e}")
+
+
+# -----------------------
+# Background refresh (stale-while-revalidate)
+# -----------------------
+REFRESHING: Set[str] = set()
+REFRESH_LOCK = threading.Lock()
+
+def refresh_in_background(name: str, fn) -> None:
+    """
+    Runs fn in a daemon thread, unless a refresh with the same name is already running.
+    Callers keep serving their stale copy meanwhile.
+    """
+    with REFRESH_LOCK:
+        if name in REFRESHING:
+            return
+        REFRESHING.add(name)
+
+    def run():
+        try:
+            fn()
+        except Exception as e:
+            print(f"[refresh] {name} failed: {e}")
+        finally:
+            with REFRESH_LOCK:
+                REFRESHING.discard(name)
+
+    threading.Thread(target=run, name=f"refresh-{name}", daemon=True).start()
 
 
 # -----------------------
@@ -160,37 +268,106 @@ def health():
 # -----------------------
 # Player search (static list + team lookup)
 # -----------------------
-TEAM_CACHE: Dict[int, str] = {}
+# ROSTER_TEAMS: player_id -> team name for everyone on a roster (set by set_roster_maps)
+ROSTER_TEAMS: Dict[int, str] = {}
+# CommonPlayerInfo results; failures are cached briefly so an API blip isn't pinned for long
+TEAM_CACHE = TTLCache(maxsize=8192, ttl=60 * 60)
+TEAM_MISS_CACHE = TTLCache(maxsize=8192, ttl=60)
+# search runs lookups on worker threads: TEAM_CACHE_LOCK guards the two caches
+# (cachetools isn't thread-safe) and the two dicts below, and a per-player lock makes
+# concurrent lookups for the same player share one CommonPlayerInfo call. Locks are
+# refcounted and dropped when their last user leaves, so only in-flight lookups hold one.
+TEAM_CACHE_LOCK = threading.Lock()
+# team_id -> full name, the format roster teams (and so ROSTER_TEAMS) use
+TEAM_FULL_NAMES: Dict[int, str] = {t["id"]: t["full_name"] for t in nba_teams.get_teams()}
+TEAM_FETCH_LOCKS: Dict[int, threading.Lock] = {}
+TEAM_FETCH_USERS: Dict[int, int] = {}
+
+def cached_team_name(player_id: int) -> Optional[str]:
+    """
+    Team name if known without a network call, else None.
+    """
+    if player_id in ROSTER_TEAMS:
+        return ROSTER_TEAMS[player_id]
+    with TEAM_CACHE_LOCK:
+        team_name = TEAM_CACHE.get(player_id)
+        if team_name is None and player_id in TEAM_MISS_CACHE:
+            team_name = "Unknown"
+    return team_name
+
 
 def get_team_name(player_id: int) -> str:
-    if player_id in TEAM_CACHE:
-        return TEAM_CACHE[player_id]
+    team_name = cached_team_name(player_id)
+    if team_name is not None:
+        return team_name
 
+    with TEAM_CACHE_LOCK:
+        fetch_lock = TEAM_FETCH_LOCKS.setdefault(player_id, threading.Lock())
+        TEAM_FETCH_USERS[player_id] = TEAM_FETCH_USERS.get(player_id, 0) + 1
     try:
-        info = commonplayerinfo.CommonPlayerInfo(player_id=player_id)
+        with fetch_lock:
+            # whoever held the lock before us may have just filled the cache
+            team_name = cached_team_name(player_id)
+            if team_name is None:
+                team_name = fetch_team_name(player_id)
+    finally:
+        with TEAM_CACHE_LOCK:
+            TEAM_FETCH_USERS[player_id] -= 1
+            if TEAM_FETCH_USERS[player_id] == 0:
+                del TEAM_FETCH_USERS[player_id]
+                del TEAM_FETCH_LOCKS[player_id]
+    return team_name
+
+
+def fetch_team_name(player_id: int) -> str:
+    try:
+        info = commonplayerinfo.CommonPlayerInfo(player_id=player_id, timeout=NBA_API_TIMEOUT)
         df = info.get_data_frames()[0]
+        # TEAM_NAME is only the nickname; report the same full name ROSTER_TEAMS uses
         team = df.loc[0, "TEAM_NAME"]
-        team_name = str(team) if team else "Unknown"
+        if team:
+            city = df.loc[0, "TEAM_CITY"]
+            team_name = TEAM_FULL_NAMES.get(int(df.loc[0, "TEAM_ID"]), f"{city} {team}".strip())
+        else:
+            team_name = "Unknown"
     except Exception:
-        team_name = "Unknown"
+        with TEAM_CACHE_LOCK:
+            TEAM_MISS_CACHE[player_id] = True
+        return "Unknown"
 
-    TEAM_CACHE[player_id] = team_name
+    with TEAM_CACHE_LOCK:
+        TEAM_CACHE[player_id] = team_name
     return team_name
 
 
+# (lowercase name, player) for every static player, built once since get_players()
+# rebuilds ~5000 dicts per call. Presorted in result order (active first, then name)
+# so a search can stop as soon as it has `limit` matches.
+SEARCH_INDEX = sorted(
+    ((p["full_name"].lower(), p) for p in nba_players.get_players()),
+    key=lambda x: (not x[1].get("is_active", False), x[1]["full_name"]),
+)
+
+
 @app.get("/players/search")
-def search_players(q: str = Query(..., min_length=1), limit: int = 10):
+async def search_players(q: str = Query(..., min_length=1), limit: int = 10):
     query = q.lower().strip()
-    all_players = nba_players.get_players()
 
-    matches = [p for p in all_players if query in p["full_name"].lower()]
-    matches.sort(key=lambda p: (not p.get("is_active", False), p["full_name"]))
-    matches = matches[: min(max(limit, 1), 25)]
+    limit = min(max(limit, 1), 25)
+    matches = list(islice((p for name, p in SEARCH_INDEX if query in name), limit))
+
+    # Active players missing from the roster snapshot (late signings, two-ways) are looked
+    # up concurrently off the event loop; retired players just show "Unknown".
+    teams = {int(p["id"]): cached_team_name(int(p["id"])) for p in matches}
+    cold = [int(p["id"]) for p in matches if p.get("is_active", False) and teams[int(p["id"])] is None]
+    cold_teams = await asyncio.gather(*(asyncio.to_thread(get_team_name, pid) for pid in cold))
+    teams.update(zip(cold, cold_teams))
 
     results = []
     for p in matches:
         pid = int(p["id"])
-        results.append({"id": pid, "name": p["full_name"], "team": get_team_name(pid)})
+        team = teams[pid] or "Unknown"
+        results.append({"id": pid, "name": p["full_name"], "team": team})
 
     return {"query": q, "count": len(results), "players": results}
 
@@ -198,66 +375,179 @@ def search_players(q: str = Query(..., min_length=1), limit: int = 10):
 # -----------------------
 # Rosters and positions (eligibility)
 # -----------------------
-# ROSTER_META: player_id -> {"name": ..., "team": ..., "raw_pos": ..., "height": ...}
-ROSTER_META: Dict[int, Dict[str, str]] = {}
-
-def build_roster_maps(season: str) -> Dict[str, int]:
-    global ROSTER_META
-    ROSTER_META = {}
+# ROSTER_DF: one row per rostered player, indexed by player_id.
+# Columns are name, team, raw_pos, height plus the derived height_in, slot, short_f.
+ROSTER_COLUMNS = ["name", "team", "raw_pos", "height"]
+ROSTER_DF = pd.DataFrame(columns=ROSTER_COLUMNS)
+ROSTER_LOADED_AT = 0.0
+ROSTER_TTL = 12 * 60 * 60  # rosters barely move within a day
 
-    teams = nba_teams.get_teams()
-    for t in teams:
-        team_id = t["id"]
-        team_name = t.get("full_name", t.get("abbreviation", "Unknown"))
-
-        try:
-            roster = commonteamroster.CommonTeamRoster(team_id=team_id, season=season)
-            df = roster.get_data_frames()[0]
-        except Exception:
-            continue
+ROSTER_FETCH_WORKERS = 8  # keep low; stats.nba.com throttles bursts
 
-        for _, row in df.iterrows():
-            try:
-                pid = int(row.get("PLAYER_ID"))
-                name = str(row.get("PLAYER", "")).strip()
-                raw_pos = str(row.get("POSITION", "")).strip()
-                height = str(row.get("HEIGHT", "")).strip()
-            except Exception:
-                continue
+def fetch_team_roster(team: dict, season: str):
+    """
+    Returns (team_name, roster rows) for one team, or (team_name, None) on failure.
+    """
+    team_name = team.get("full_name", team.get("abbreviation", "Unknown"))
+    try:
+        roster = commonteamroster.CommonTeamRoster(
+            team_id=team["id"], season=season, timeout=NBA_API_TIMEOUT
+        )
+        df = roster.get_data_frames()[0]
+        return team_name, df[["PLAYER_ID", "PLAYER", "POSITION", "HEIGHT"]]
+    except Exception:
+        return team_name, None
 
-            if not pid or not name:
-                continue
 
-            ROSTER_META[pid] = {
-                "name": name,
-                "team": str(team_name),
-                "raw_pos": raw_pos,
-                "height": height,
-            }
+def build_roster_maps(season: str) -> Dict[str, int]:
+    teams = nba_teams.get_teams()
+    # roster calls are independent and network-bound, so overlap them
+    with ThreadPoolExecutor(max_workers=ROSTER_FETCH_WORKERS) as ex:
+        results = list(ex.map(lambda t: fetch_team_roster(t, season), teams))
+
+    frames = [rows.assign(TEAM=str(team_name)) for team_name, rows in results if rows is not None]
+    if not frames:
+        # every roster call failed; keep serving the maps we already have
+        return {"players": len(ROSTER_DF), "teams": len(teams)}
+    rows = pd.concat(frames, ignore_index=True)
+
+    pids = pd.to_numeric(rows["PLAYER_ID"], errors="coerce")
+    names = rows["PLAYER"].astype(str).str.strip()
+    keep = pids.notna() & (pids != 0) & (names != "")
+
+    roster = pd.DataFrame(
+        {
+            "name": names[keep],
+            "team": rows["TEAM"][keep],
+            "raw_pos": rows["POSITION"][keep].astype(str).str.strip(),
+            "height": rows["HEIGHT"][keep].astype(str).str.strip(),
+        }
+    )
+    roster.index = pd.Index(pids[keep].astype(np.int64), name="PLAYER_ID")
+    # a player traded mid-season shows up twice; keep the last team seen
+    roster = roster[~roster.index.duplicated(keep="last")]
+
+    if roster.empty:
+        return {"players": len(ROSTER_DF), "teams": len(teams)}
+
+    set_roster_maps(roster, time.time())
+    save_disk_cache(disk_cache_path("roster", season), {"roster": roster, "teams": len(teams)})
+    return {"players": len(ROSTER_DF), "teams": len(teams)}
+
+
+def set_roster_maps(roster: pd.DataFrame, loaded_at: float) -> None:
+    global ROSTER_DF, ROSTER_TEAMS, ROSTER_LOADED_AT
+
+    df = roster[ROSTER_COLUMNS].copy()
+    # Slot only depends on roster data, except F under 6'9" which also needs 3PT%.
+    # Store their fallback (PF) in "slot" and flag them so build_candidates can fix them up.
+    df["height_in"] = np.array([parse_height_inches(h) for h in df["height"]], dtype=np.int16)
+    slot = base_slots(df["raw_pos"], df["height_in"].to_numpy())
+    df["short_f"] = slot == SHORT_F
+    df["slot"] = np.where(df["short_f"], "PF", slot)
+    # a handful of distinct values each, so store them as categoricals
+    for c in ["team", "raw_pos", "slot"]:
+        df[c] = df[c].astype("category")
+    ROSTER_DF = df
+    ROSTER_TEAMS = dict(zip(df.index.tolist(), df["team"].tolist()))
+    ROSTER_LOADED_AT = loaded_at
+    clear_game_caches()  # built from the old roster
+
+
+def load_roster_maps(season: str) -> Optional[Dict[str, int]]:
+    """
+    Loads roster maps saved by build_roster_maps if they are fresh enough.
+    Returns None when the network build is needed.
+    """
+    path = disk_cache_path("roster", season)
+    cached = load_disk_cache(path, ROSTER_TTL)
+    if not cached or cached.get("roster") is None or cached["roster"].empty:
+        return None
 
-    return {"players": len(ROSTER_META), "teams": len(teams)}
+    set_roster_maps(cached["roster"], os.path.getmtime(path))
+    return {"players": len(ROSTER_DF), "teams": cached["teams"]}
 
 
 # -----------------------
 # Season stats (tiering, excludes no-stats)
 # -----------------------
-STATS_CACHE = TTLCache(maxsize=2, ttl=60 * 60)  # 1 hour cache
+# STATS_CACHE: season -> {"df": stats frame, "fetched_at": unix time}
+# Entries never expire; once older than STATS_TTL they're served stale while a
+# background refresh swaps in a new frame, so no request waits on the API.
+STATS_CACHE: Dict[str, dict] = {}
+STATS_TTL = 60 * 60  # 1 hour
+
+# per-game box stats are approximate anyway; float32 halves the cached frame.
+# FG3_PCT stays float64 since the 32% SF rule compares it exactly.
+# SCORE inputs stay float64: float32 rounding noise would reorder exact ties in the pool
+SCORE_COLUMNS = ["PTS", "REB", "AST", "STL", "BLK", "TOV"]
+STATS_FLOAT32_COLUMNS = ["MIN"]  # only ever compared against 0
+# the only dashboard columns anything reads; the endpoint returns ~60
+STATS_COLUMNS = ["PLAYER_ID", "GP", "FG3_PCT", *SCORE_COLUMNS, *STATS_FLOAT32_COLUMNS]
+
+
+def stats_frame(result_set: dict) -> pd.DataFrame:
+    """
+    Builds the stats frame straight from the raw result set, keeping STATS_COLUMNS only.
+    """
+    headers = result_set["headers"]
+    columns = list(zip(*result_set["rowSet"])) or [()] * len(headers)
+    by_name = dict(zip(headers, columns))
+    return pd.DataFrame({c: list(by_name[c]) for c in STATS_COLUMNS})
+
+def compact_stats_df(df: pd.DataFrame) -> pd.DataFrame:
+    for c in STATS_FLOAT32_COLUMNS:
+        df[c] = pd.to_numeric(df[c], downcast="float")
+    df["GP"] = pd.to_numeric(df["GP"], downcast="integer")
+    return df
+
 
 def get_season_stats_df():
-    if SEASON_2024_25 in STATS_CACHE:
-        return STATS_CACHE[SEASON_2024_25]
+    entry = STATS_CACHE.get(SEASON_2024_25)
+    if entry is None:
+        entry = load_season_stats()
+
+    if time.time() - entry["fetched_at"] > STATS_TTL:
+        refresh_in_background("stats", fetch_season_stats)
+    return entry["df"]
+
+
+def load_season_stats() -> dict:
+    """
+    Cold start: use the disk copy whatever its age (get_season_stats_df refreshes it
+    in the background if stale), else block on the API.
+    """
+    path = disk_cache_path("stats", SEASON_2024_25)
+    df = load_disk_cache(path, float("inf"))
+    if df is not None:
+        return set_season_stats(df, os.path.getmtime(path))
+    return fetch_season_stats()
+
 
+def fetch_season_stats() -> dict:
     dash = leaguedashplayerstats.LeagueDashPlayerStats(
         season=SEASON_2024_25,
         season_type_all_star="Regular Season",
         per_mode_detailed="PerGame",
+        timeout=NBA_API_TIMEOUT,
     )
-    df = dash.get_data_frames()[0]
-    STATS_CACHE[SEASON_2024_25] = df
-    return df
+    df = compact_stats_df(stats_frame(dash.get_dict()["resultSets"][0]))
+    save_disk_cache(disk_cache_path("stats", SEASON_2024_25), df)
+    return set_season_stats(df, time.time())
+
+
+def set_season_stats(df: pd.DataFrame, fetched_at: float) -> dict:
+    # derived once per snapshot rather than on every build_candidates call
+    df["SCORE"] = production_scores(df)
+    df["FG3_PERCENT"] = three_pt_pct(df["FG3_PCT"])
+
+    entry = {"df": df, "fetched_at": fetched_at}
+    STATS_CACHE[SEASON_2024_25] = entry
+    clear_game_caches()  # built from the old frame
+    return entry
 
 
-def build_candidates(slot: Optional[str] = None) -> List[dict]:
+def build_candidates(slot: Optional[str] = None) -> dict:
     """
     Candidate pool rules:
       1) Must have season stats row (2024-25)
@@ -274,77 +564,120 @@ def build_candidates(slot: Optional[str] = None) -> List[dict]:
             raise HTTPException(status_code=400, detail="slot must be one of PG, SG, SF, PF, C")
         slot_norm = s
 
-    if len(ROSTER_META) == 0:
+    if ROSTER_DF.empty:
         raise HTTPException(status_code=503, detail="Roster map empty. Restart backend or call POST /admin/refresh_rosters.")
+    if time.time() - ROSTER_LOADED_AT > ROSTER_TTL:
+        refresh_in_background("roster", lambda: build_roster_maps(SEASON_2024_25))
 
-    candidates: List[dict] = []
+    # inner join on player id keeps rostered players and brings their roster columns along
+    df = df[(df["GP"] > 0) & (df["MIN"] > 0)].join(
+        ROSTER_DF[["name", "team", "slot", "short_f"]], on="PLAYER_ID", how="inner"
+    )
 
-    for _, row in df.iterrows():
-        try:
-            pid = int(row.get("PLAYER_ID"))
-        except Exception:
-            continue
-
-        meta = ROSTER_META.get(pid)
-        if not meta:
-            continue
-
-        gp = float(row.get("GP", 0))
-        min_pg = float(row.get("MIN", 0))
-        if gp <= 0 or min_pg <= 0:
-            continue
-
-        if slot_norm is not None:
-            raw_pos = meta.get("raw_pos", "")
-            height = meta.get("height", "")
-            fg3pct = three_pt_pct(row)
-            player_slot = normalize_position(raw_pos, height, fg3pct)
-            if player_slot != slot_norm:
-                continue
+    if slot_norm is not None:
+        # F shorter than 6'9" with 3PT% >= 32% plays SF; the stored slot is their PF fallback
+        short_f_sf = df["short_f"].to_numpy() & (df["FG3_PERCENT"].to_numpy() >= 32.0)
+        player_slot = np.where(short_f_sf, "SF", df["slot"].to_numpy())
+        df = df[player_slot == slot_norm]
+
+    # parallel columns (one entry per candidate) rather than a dict per player
+    return {
+        "id": df["PLAYER_ID"].to_numpy(dtype=np.int64),
+        "name": df["name"].tolist(),
+        "team": df["team"].tolist(),
+        "score": df["SCORE"].to_numpy(dtype=np.float64),
+    }
+
+
+# Tiers only change when stats/rosters do; cases and banker offers just draw from them.
+# TIERS_CACHE: (season, slot) -> candidate columns + "tiers": tiers[0..15] of candidate indices
+TIERS_CACHE = TTLCache(maxsize=8, ttl=60 * 60)
+# guards TIERS_CACHE; concurrent misses for one slot wait for the first build instead of repeating it
+TIERS_CONDITION = threading.Condition()
+# Finished responses, since (slot, seed) fully determines them for a given pool.
+# CASES_CACHE: (season, slot, seed) -> cases_by_slot payload
+# OFFERS_CACHE: (season, slot, seed, target_tier, exclude ids) -> banker_offer payload
+CASES_CACHE = TTLCache(maxsize=256, ttl=60 * 60)
+OFFERS_CACHE = TTLCache(maxsize=256, ttl=60 * 60)
+# endpoints run on the threadpool and refreshes clear from background threads
+RESPONSE_CACHE_LOCK = threading.Lock()
+
+def clear_game_caches() -> None:
+    """
+    Drops everything derived from the current stats/roster snapshot.
+    """
+    with TIERS_CONDITION:
+        TIERS_CACHE.clear()
+    with RESPONSE_CACHE_LOCK:
+        CASES_CACHE.clear()
+        OFFERS_CACHE.clear()
 
-        score = production_score_pergame(row)
 
-        candidates.append(
-            {
-                "id": pid,
-                "name": meta["name"],
-                "team": meta["team"],
-                "score": score,
-            }
-        )
+def compute_tiers(candidates: dict) -> dict:
+    n = len(candidates["id"])
+    if n < 16:
+        raise HTTPException(status_code=400, detail=f"Not enough candidates. Found {n}.")
 
-    return candidates
+    order = np.argsort(-candidates["score"], kind="stable")
+    return {**candidates, "tiers": split_into_16_tiers(order)}
 
 
-def build_case_pool_from_candidates(candidates: List[dict], seed: int) -> List[dict]:
-    candidates.sort(key=lambda x: x["score"], reverse=True)
-    if len(candidates) < 16:
-        raise HTTPException(status_code=400, detail=f"Not enough candidates. Found {len(candidates)}.")
+def pool_player(pool: dict, i: int) -> dict:
+    return {"id": int(pool["id"][i]), "name": pool["name"][i], "team": pool["team"][i]}
 
-    tiers = split_into_16_tiers(candidates)
 
-    rng = random.Random(seed)
-    chosen = []
-    for tier_index, tier_players in enumerate(tiers, start=1):
-        if not tier_players:
-            raise HTTPException(status_code=500, detail=f"Tier {tier_index} ended up empty.")
-        pick = rng.choice(tier_players)
-        chosen.append({"tier": tier_index, "player": pick})
-
-    rng.shuffle(chosen)
-
-    cases = []
-    for case_number, item in enumerate(chosen, start=1):
-        p = item["player"]
-        cases.append(
-            {
-                "case": case_number,
-                "tier": item["tier"],
-                "player": {"id": p["id"], "name": p["name"], "team": p["team"]},
-                "score": round(p["score"], 2),
-            }
-        )
-    return cases
+def pick_not_excluded(
+    tier: np.ndarray, ids: np.ndarray, exclude: FrozenSet[int], rng: random.Random, max_tries: int = 32
+) -> Optional[int]:
+    """
+    Uniform pick of a pool index from tier whose id isn't excluded, or None if none are left.
+    Exclusions are a handful of ids, so rejection sampling nearly always hits first try;
+    the filtered array is only built when that keeps missing.
+    """
+    if len(tier) == 0:
+        return None
+    for _ in range(max_tries):
+        i = int(tier[rng.randrange(len(tier))])
+        if int(ids[i]) not in exclude:
+            return i
+
+    exclude_arr = np.fromiter(exclude, dtype=np.int64, count=len(exclude))
+    available = tier[~np.isin(ids[tier], exclude_arr)]
+    return int(rng.choice(available)) if len(available) else None
+
+
+@cached(TIERS_CACHE, key=lambda slot_norm: (SEASON_2024_25, slot_norm), condition=TIERS_CONDITION)
+def get_tiers(slot_norm: str) -> dict:
+    """
+    Tiered pool for a normalized slot, shared by cases_by_slot and banker_offer.
+    """
+    return compute_tiers(build_candidates(slot=slot_norm))
+
+
+def draw_cases(pool: dict, seed: int) -> List[dict]:
+    tiers = pool["tiers"]
+    sizes = np.array([len(t) for t in tiers])
+    empty = np.flatnonzero(sizes == 0)
+    if len(empty):
+        raise HTTPException(status_code=500, detail=f"Tier {int(empty[0]) + 1} ended up empty.")
+
+    # default_rng rejects negative seeds, so fold them into the unsigned 64-bit range
+    rng = np.random.default_rng(seed & 0xFFFF_FFFF_FFFF_FFFF)
+    picks = rng.integers(0, sizes)   # one pick per tier, in a single call
+    tier_order = rng.permutation(16)  # shuffles tiers into cases
+
+    # only the 16 winners get turned into dicts
+    chosen = [int(tiers[t][picks[t]]) for t in tier_order.tolist()]
+    scores = np.round(pool["score"][chosen], 2).tolist()  # plain floats for orjson
+    return [
+        {
+            "case": case_number,
+            "tier": int(t) + 1,
+            "player": pool_player(pool, i),
+            "score": score,
+        }
+        for case_number, (t, i, score) in enumerate(zip(tier_order, chosen, scores), start=1)
+    ]
 
 
 # -----------------------
@@ -356,19 +689,52 @@ def refresh_rosters():
     return {"season": SEASON_2024_25, **info}
 
 @app.post("/admin/refresh_stats")
-def refresh_stats():
-    df = get_season_stats_df()
+def refresh_stats(force: bool = False):
+    """
+    force=1 refetches from the API, skipping the in-memory and disk copies.
+    """
+    if force:
+        df = fetch_season_stats()["df"]
+    else:
+        df = get_season_stats_df()
+        clear_game_caches()
     return {"season": SEASON_2024_25, "rows": int(df.shape[0])}
 
+# player_id is echoed back, and orjson only encodes 64-bit ints
+@app.post("/admin/players/{player_id}/refresh_team")
+def refresh_player_team(player_id: int = Path(..., ge=1, le=2**63 - 1)):
+    with TEAM_CACHE_LOCK:
+        TEAM_CACHE.pop(player_id, None)
+        TEAM_MISS_CACHE.pop(player_id, None)
+    return {"id": player_id, "team": get_team_name(player_id)}
+
 @app.get("/admin/roster_count")
 def roster_count():
-    return {"season": SEASON_2024_25, "players": len(ROSTER_META)}
+    return {"season": SEASON_2024_25, "players": len(ROSTER_DF)}
+
+def warm_stats_cache() -> None:
+    try:
+        df = get_season_stats_df()
+        print(f"[startup] stats loaded: {int(df.shape[0])} rows")
+    except Exception as e:
+        print(f"[startup] stats load failed: {e}")
+
+
+# keeps a reference so the warm-up task isn't garbage collected mid-flight
+STARTUP_TASKS: List[asyncio.Task] = []
 
 @app.on_event("startup")
-def on_startup():
+async def on_startup():
+    # stats don't depend on rosters, so fetch them in the background
+    STARTUP_TASKS.append(asyncio.create_task(asyncio.to_thread(warm_stats_cache)))
+
     try:
-        info = build_roster_maps(SEASON_2024_25)
-        print(f"[startup] roster loaded: {info}")
+        info = await asyncio.to_thread(load_roster_maps, SEASON_2024_25)
+        if info is not None:
+            print(f"[startup] roster loaded from disk: {info}")
+        else:
+            info = await asyncio.to_thread(build_roster_maps, SEASON_2024_25)
+            print(f"[startup] roster loaded: {info}")
     except Exception as e:
         print(f"[startup] roster load failed: {e}")
 
@@ -377,10 +743,20 @@ def on_startup():
 # Game endpoints
 # -----------------------
 @app.get("/game/cases_by_slot")
-def generate_cases_by_slot(seed: int = 1, slot: str = "PG"):
-    candidates = build_candidates(slot=slot)
-    cases = build_case_pool_from_candidates(candidates, seed)
-    return {"season": SEASON_2024_25, "seed": seed, "slot": slot.upper().strip(), "cases": cases}
+def generate_cases_by_slot(
+    seed: int = Query(1, ge=-2**63, le=2**63 - 1),  # echoed back; orjson only encodes 64-bit ints
+    slot: str = "PG",
+):
+    slot_norm = slot.upper().strip()
+    key = (SEASON_2024_25, slot_norm, seed)
+    with RESPONSE_CACHE_LOCK:
+        payload = CASES_CACHE.get(key)
+    if payload is None:
+        cases = draw_cases(get_tiers(slot_norm), seed)
+        payload = {"season": SEASON_2024_25, "seed": seed, "slot": slot_norm, "cases": cases}
+        with RESPONSE_CACHE_LOCK:
+            CASES_CACHE[key] = payload
+    return payload
 
 
 @app.get("/game/banker_offer")
@@ -400,47 +776,44 @@ def banker_offer(
     if slot_norm not in {"PG", "SG", "SF", "PF", "C"}:
         raise HTTPException(status_code=400, detail="slot must be one of PG, SG, SF, PF, C")
 
-    exclude: Set[int] = set()
-    if exclude_ids.strip():
-        for part in exclude_ids.split(","):
-            part = part.strip()
-            if not part:
-                continue
+    parts = [part for part in exclude_ids.split(",") if part.strip()]
+    try:
+        exclude: FrozenSet[int] = frozenset(map(int, parts))  # int() tolerates surrounding spaces
+    except ValueError:
+        # rare malformed list: keep the tokens that parse
+        valid: Set[int] = set()
+        for part in parts:
             try:
-                exclude.add(int(part))
-            except Exception:
+                valid.add(int(part))
+            except ValueError:
                 continue
+        exclude = frozenset(valid)
 
-    candidates = build_candidates(slot=slot_norm)
-    candidates.sort(key=lambda x: x["score"], reverse=True)
-    if len(candidates) < 16:
-        raise HTTPException(status_code=400, detail=f"Not enough candidates for slot {slot_norm}.")
+    desired = clamp_tier(int(target_tier))
+    key = (SEASON_2024_25, slot_norm, seed, desired, exclude)
+    with RESPONSE_CACHE_LOCK:
+        offer = OFFERS_CACHE.get(key)
+    if offer is not None:
+        return offer
 
-    tiers = split_into_16_tiers(candidates)
+    pool = get_tiers(slot_norm)
+    ids, tiers = pool["id"], pool["tiers"]
 
     rng = random.Random(seed)
 
     # try requested tier first, then expand outward if needed
-    desired = clamp_tier(int(target_tier))
-    tier_order = [desired]
-    for d in range(1, 16):
-        lo = desired - d
-        hi = desired + d
-        if lo >= 1:
-            tier_order.append(lo)
-        if hi <= 16:
-            tier_order.append(hi)
-
-    for t in tier_order:
-        pool = [p for p in tiers[t - 1] if int(p["id"]) not in exclude]
-        if pool:
-            pick = rng.choice(pool)
-            return {
+    for t in TIER_EXPANSION_ORDER[desired - 1]:
+        i = pick_not_excluded(tiers[t - 1], ids, exclude, rng)
+        if i is not None:
+            offer = {
                 "season": SEASON_2024_25,
                 "slot": slot_norm,
                 "target_tier": desired,
                 "picked_tier": t,
-                "player": {"id": pick["id"], "name": pick["name"], "team": pick["team"]},
+                "player": pool_player(pool, i),
             }
+            with RESPONSE_CACHE_LOCK:
+                OFFERS_CACHE[key] = offer
+            return offer
 
     raise HTTPException(status_code=404, detail="No available banker offer found after exclusions.")